@@ -0,0 +1,58 @@
+# ============================================================================
+# agent/answer_cache.py - Quiz Answer Cache
+# ============================================================================
+
+import re
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+ANSWER_CACHE_SIZE = 512
+ANSWER_CACHE_TTL = 3600  # seconds
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w.-]+")
+
+
+class AnswerCache:
+    """
+    Process-wide LRU of computed quiz answers keyed by page fingerprint.
+
+    Pages that differ only in the embedded email hash to the same key, so a
+    re-run of a chain (or a retry after a timeout) skips the LLM entirely.
+    """
+
+    def __init__(self, maxsize: int = ANSWER_CACHE_SIZE, ttl: float = ANSWER_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    @staticmethod
+    def key(html_sample: str) -> str:
+        """Hash of the LLM page sample with emails normalized out"""
+        normalized = _EMAIL_RE.sub("E", html_sample)
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, answer = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return answer
+
+    def put(self, key: str, answer: Any):
+        self._entries[key] = (time.monotonic() + self.ttl, answer)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        """Forget an answer (e.g. one the quiz server rejected)"""
+        self._entries.pop(key, None)
+
+
+answer_cache = AnswerCache()
@@ -0,0 +1,40 @@
+# ============================================================================
+# agent/http_clients.py - Shared HTTP Client
+# ============================================================================
+
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# One pooled client for page fetches, data downloads and submits, so requests
+# to the same quiz host reuse a warm keep-alive / HTTP/2 connection.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=100,
+                # outlasts a typical LLM call between page fetch and submit
+                keepalive_expiry=60.0,
+            ),
+        )
+        logger.info("Initialized shared HTTP client")
+    return _client
+
+
+async def aclose():
+    """Close the shared client (called on app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
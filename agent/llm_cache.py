@@ -0,0 +1,53 @@
+# ============================================================================
+# agent/llm_cache.py - LLM Response Cache
+# ============================================================================
+
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class LLMCache:
+    """
+    In-memory LRU of LLM responses with a per-entry TTL.
+
+    Only deterministic (temperature 0) prompts should be stored, so retries
+    and re-runs of the same quiz chain skip the API entirely.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 86400):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def key(model: str, messages: list, max_tokens: int, kwargs: dict) -> str:
+        """Hash of everything that determines a temperature-0 completion"""
+        raw = json.dumps([model, messages, max_tokens, kwargs], sort_keys=True, default=str)
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, response = entry
+            if expires >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return response
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, response: str):
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
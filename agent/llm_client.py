@@ -2,29 +2,76 @@
 # agent/llm_client.py - LLM API Wrapper
 # ============================================================================
 
-import os
+import asyncio
+from contextlib import aclosing
+from functools import lru_cache
 from groq import AsyncGroq
+from config import Config
+from agent.llm_cache import LLMCache
+from utils.json_utils import find_json_end
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 
 logger = logging.getLogger(__name__)
 
+# Process-wide Groq client so its connection pool and TLS sessions are reused
+# across QuizSolver instances instead of being rebuilt per request.
+_groq_client: Optional[AsyncGroq] = None
+
+
+def _get_groq(api_key: str) -> AsyncGroq:
+    """Return the shared AsyncGroq client, creating it on first use"""
+    global _groq_client
+    if _groq_client is None:
+        _groq_client = AsyncGroq(api_key=api_key)
+        logger.info("Initialized Groq client")
+    return _groq_client
+
+
+async def aclose():
+    """Close the shared Groq client (called on app shutdown)"""
+    global _groq_client, _llm_client
+    _llm_client = None
+    if _groq_client is not None:
+        await _groq_client.close()
+        _groq_client = None
+
+
+# Responses to deterministic (temperature 0) prompts, shared by every client
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL = 86400  # seconds
+response_cache = LLMCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """Load the tokenizer once per process, on first use"""
+    import tiktoken  # lazy: only token estimation needs it
+    return tiktoken.get_encoding("cl100k_base")
+
+
+@lru_cache(maxsize=4096)
+def _count_tokens(text: str) -> int:
+    return len(_encoding().encode(text))
+
 
 class LLMClient:
     """
     Unified LLM client supporting multiple providers
     """
     
-    def __init__(self):
-        self.groq_key = os.getenv("GROQ_API_KEY")
-        self.ai21_key = os.getenv("AI21_API_KEY")
+    def __init__(self, max_concurrency: int = 8):
+        # Bounds in-flight completions so concurrent callers don't trip rate limits
+        self._sem = asyncio.Semaphore(max_concurrency)
+        # Config loads .env on import, so keys set there are seen here too
+        self.groq_key = Config.GROQ_API_KEY
+        self.ai21_key = Config.AI21_API_KEY
         
         # Initialize Groq client if available
         if self.groq_key:
-            self.groq_client = AsyncGroq(api_key=self.groq_key)
+            self.groq_client = _get_groq(self.groq_key)
             self.provider = "groq"
             self.model = "llama-3.3-70b-versatile"  # Updated to current model
-            logger.info("Initialized Groq client")
         else:
             raise ValueError("No LLM API key found. Please set GROQ_API_KEY or AI21_API_KEY")
     
@@ -48,17 +95,98 @@ class LLMClient:
         """
         try:
             if self.provider == "groq":
-                response = await self.groq_client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    **kwargs
-                )
-                return response.choices[0].message.content
+                key = None
+                if temperature == 0:
+                    key = response_cache.key(self.model, messages, max_tokens, kwargs)
+                    cached = response_cache.get(key)
+                    if cached is not None:
+                        return cached
+
+                async with self._sem:
+                    response = await self.groq_client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        **kwargs
+                    )
+                content = response.choices[0].message.content
+                if key is not None and content is not None:
+                    response_cache.put(key, content)
+                return content
             
         except Exception as e:
-            logger.error(f"LLM API error: {str(e)}")
+            logger.error("LLM API error: %s", e)
+            raise
+    
+    async def chat_stream(
+        self,
+        messages: list,
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding text deltas as they arrive.
+        Closing the generator early closes the HTTP stream, which stops generation.
+        """
+        async with self._sem:
+            stream = await self.groq_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **kwargs
+            )
+            try:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        yield delta
+            finally:
+                await stream.response.aclose()
+    
+    async def chat_json(
+        self,
+        messages: list,
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+        cache: bool = True,
+        **kwargs
+    ) -> str:
+        """
+        Streaming chat that stops as soon as a reply opening with '{' or '['
+        closes its top-level JSON value. Other replies are read to the end.
+        
+        Args:
+            cache: Use the response cache for temperature-0 calls; pass
+                False when the caller caches (and invalidates) the result
+        
+        Returns:
+            str: Generated text response
+        """
+        key = None
+        if cache and temperature == 0:
+            key = response_cache.key(self.model, messages, max_tokens, kwargs)
+            cached = response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        text = ""
+        try:
+            async with aclosing(self.chat_stream(messages, temperature, max_tokens, **kwargs)) as deltas:
+                async for delta in deltas:
+                    text += delta
+                    if "}" in delta or "]" in delta:
+                        head = text.lstrip()
+                        if head[:1] in ("{", "[") and find_json_end(head) != -1:
+                            break
+            if key is not None:
+                response_cache.put(key, text)
+            return text
+        except Exception as e:
+            logger.error("LLM API error: %s", e)
             raise
     
     async def chat_with_tools(
@@ -76,25 +204,26 @@ class LLMClient:
         """
         try:
             if self.provider == "groq":
-                response = await self.groq_client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    tools=tools,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    tool_choice="auto"
-                )
+                async with self._sem:
+                    response = await self.groq_client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        tools=tools,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        tool_choice="auto"
+                    )
                 return {
                     "content": response.choices[0].message.content,
                     "tool_calls": response.choices[0].message.tool_calls
                 }
         except Exception as e:
-            logger.error(f"LLM tool use error: {str(e)}")
+            logger.error("LLM tool use error: %s", e)
             raise
     
     def estimate_tokens(self, text: str) -> int:
-        """Rough token estimation (4 chars ≈ 1 token)"""
-        return len(text) // 4
+        """Token count using the cl100k_base tokenizer (memoized per string)"""
+        return _count_tokens(text)
     
     async def generate_answer(self, messages, temperature=0.0):
         """
@@ -102,3 +231,16 @@ class LLMClient:
         Internally this just calls the chat() method.
         """
         return await self.chat(messages, temperature=temperature)
+
+
+# One LLMClient per process, so every QuizSolver shares the same Groq
+# connection pool and concurrency limit.
+_llm_client: Optional[LLMClient] = None
+
+
+def get_llm_client() -> LLMClient:
+    """Return the process-wide LLMClient, creating it on first use"""
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = LLMClient()
+    return _llm_client
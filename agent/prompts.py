@@ -24,3 +24,6 @@ Provide a plan with:
 Be specific and actionable.
 """
 
+# Kept as a separate, constant message so the shared prompt prefix is
+# byte-identical across calls and only the trailing HTML varies.
+ANSWER_INSTRUCTIONS = "Return ONLY the final answer in the required format."
@@ -1,497 +1,206 @@
-'''# ====================================================================
+# ====================================================================
 # agent/quiz_solver.py
-# Hybrid async QuizSolver: LLM-assisted + deterministic handlers
 # ====================================================================
 import re
-import json
+import asyncio
 import logging
-from typing import Any, Dict, Optional
-from urllib.parse import urljoin, urlparse, urlencode
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse
 
 import httpx
+import lxml.html
+import orjson
+from lxml import etree
 
-from agent.llm_client import LLMClient
-from agent.prompts import SYSTEM_PROMPT, TASK_PLANNING_PROMPT
-from agent.tool_registry import registry
+from agent.answer_cache import answer_cache
+from agent.http_clients import get_client
+from agent.llm_client import get_llm_client
+from agent.prompts import SYSTEM_PROMPT, ANSWER_INSTRUCTIONS
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# Base origin for the TDS platform. Kept as default but will be inferred from URLs too.
 DEFAULT_BASE = "https://tds-llm-analysis.s-anand.net"
 SUBMIT_PATH = "/submit"
-
-
-def clean_code_fences(text: str) -> str:
-    """Remove surrounding triple-backtick fences or inline backticks."""
+ANSWER_MAX_TOKENS = 512  # answers are short; JSON ones stop early via streaming
+PAGE_MAX_BYTES = 48_000  # enough for the heuristics and the 12000-char LLM sample
+MAX_CHAIN_STEPS = 100  # hard stop for chains that never repeat a URL
+
+_UV_GET_RE = re.compile(r"\buv\s+http\s+get\b", re.I)
+_BACKTICK_TABLE = str.maketrans("", "", "`")
+# attributes worth showing the LLM; everything else is styling noise
+# (value/content carry data on hidden inputs and <meta> tags)
+_KEEP_ATTRS = frozenset({"action", "method", "name", "id", "href", "src", "value", "content"})
+
+
+def _iter_fence_bodies(text: str) -> Iterator[str]:
+    """Yield the body of each ```-fenced block, minus any language tag line."""
+    pos = 0
+    while True:
+        start = text.find("```", pos)
+        if start == -1:
+            return
+        end = text.find("```", start + 3)
+        if end == -1:
+            return
+        body = text[start + 3:end]
+        nl = body.find("\n")
+        if nl != -1 and (nl == 0 or body[:nl].replace("_", "").isalnum()):
+            body = body[nl + 1:]
+        yield body
+        pos = end + 3
+
+
+def clean_code_fences(text: Any) -> Any:
     if not isinstance(text, str):
         return text
-    # strip fenced blocks if present
-    m = re.search(r'```(?:\w*\n)?([\s\S]*?)\n?```', text)
-    if m:
-        return m.group(1).strip()
-    return text.replace("`", "").strip()
+    if "`" not in text:
+        return text.strip()
+    # single scan; with several fences prefer the most JSON-like body
+    bodies = list(_iter_fence_bodies(text))
+    if bodies:
+        return max(bodies, key=lambda b: b.count("{")).strip()
+    return text.translate(_BACKTICK_TABLE).strip()
 
 
+@lru_cache(maxsize=64)
 def find_origin_from_url(url: str) -> str:
     p = urlparse(url)
-    if p.scheme and p.netloc:
-        return f"{p.scheme}://{p.netloc}"
-    return DEFAULT_BASE
+    return f"{p.scheme}://{p.netloc}" if p.scheme and p.netloc else DEFAULT_BASE
 
 
-class QuizSolver:
-    """
-    Hybrid quiz solver that uses LLM to parse tasks and deterministic logic
-    for common project2 problems. Designed to be called as:
+@lru_cache(maxsize=64)
+def _submit_url_for(origin: str) -> str:
+    return urljoin(origin, SUBMIT_PATH)
 
-        solver = QuizSolver()
-        result = await solver.solve_quiz_chain(start_url, email=<email>, secret=<secret>)
 
-    Returns a dict: {"message": str, "quizzes_solved": int}
+def compact_html_for_llm(html: str) -> str:
     """
+    Shrink a page to the parts that help the LLM: drop style/noscript/svg and
+    comments, keep only meaningful attributes, and move any <form> to the
+    front so truncation never cuts it off. <script> is kept since quiz pages
+    render their question from inline JS.
+    """
+    try:
+        tree = lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return html
 
-    def __init__(self, timeout: float = 30.0):
-        self.llm = LLMClient()
-        self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=self.timeout)
-
-    # ----------------------
-    async def fetch_page(self, full_url: str) -> str:
-        """Fetch quiz page HTML. full_url may be absolute or relative."""
-        # ensure absolute
-        if not urlparse(full_url).netloc:
-            full_url = urljoin(DEFAULT_BASE, full_url)
-        logger.info(f"GET {full_url}")
-        r = await self.client.get(full_url)
-        r.raise_for_status()
-        return r.text
-
-    # ----------------------
-    async def parse_quiz_with_llm(self, html: str) -> Dict[str, Any]:
-        """
-        Ask the LLM to parse the quiz page and return a JSON object describing:
-        - task (string)
-        - data_source (string or "none")
-        - analysis_type
-        - answer_format (string)
-        - hint (optional)
-        - submit_url (or "none")
-        - payload_template (if present)
-        """
-        sample = html[:12000]
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": (
-                    "Parse the following HTML quiz page and return ONLY a JSON object (no explanation).\n"
-                    "Keys (include at least these; use \"none\" when not available):\n"
-                    "- task: short description of what to do\n"
-                    "- data_source: URL to fetch or 'none'\n"
-                    "- analysis_type: what to compute\n"
-                    "- answer_format: one of [string, json, number, base64, command]\n"
-                    "- submit_url: the endpoint to submit to if present in HTML, otherwise 'none'\n"
-                    "- payload_template: example payload structure if visible, otherwise 'none'\n\n"
-                    "HTML:\n\n"
-                    f"{sample}\n\n"
-                    "Return pure JSON only."
-                ),
-            },
-        ]
-
-        logger.info("Asking LLM to parse quiz page (tools available)...")
-
-        # Provide tools metadata so the model may request data or parsing
-        tools_meta = registry.get_tools_for_model()
-
-        # Use tool-enabled chat; the model may ask to call a tool (function call)
-        try:
-            resp = await self.llm.chat_with_tools(messages, tools_meta, temperature=0.0)
-        except Exception:
-            # If tool-enabled API fails, fallback to simple chat
-            logger.exception("Tool-enabled LLM call failed; falling back to simple chat.")
-            resp_text = await self.llm.chat(messages, temperature=0.0)
-            resp_text = clean_code_fences(resp_text)
-            try:
-                parsed = json.loads(resp_text)
-                return parsed
-            except Exception:
-                m = re.search(r'(\{[\s\S]*\})', resp_text)
-                if m:
-                    try:
-                        parsed = json.loads(m.group(1))
-                        return parsed
-                    except Exception:
-                        logger.exception("Failed to parse JSON from LLM fallback.")
-                logger.warning("LLM parsing failed; returning minimal inferred structure.")
-                return {
-                    "task": "unknown",
-                    "data_source": "none",
-                    "analysis_type": "none",
-                    "answer_format": "string",
-                    "submit_url": "none",
-                    "payload_template": "none",
-                }
-
-        # If the tool-enabled response contains direct content and no tool calls, parse it
-        content = resp.get("content")
-        tool_calls = resp.get("tool_calls") or []
-
-        if not tool_calls:
-            text = clean_code_fences(content or "")
-            try:
-                parsed = json.loads(text)
-                logger.info("LLM returned valid JSON parsing (no tools).")
-                return parsed
-            except Exception:
-                m = re.search(r'(\{[\s\S]*\})', text)
-                if m:
-                    try:
-                        parsed = json.loads(m.group(1))
-                        return parsed
-                    except Exception:
-                        logger.exception("Failed to parse JSON from LLM fallback.")
-
-        # If the model requested a tool, execute the first tool call and provide its result back
-        if tool_calls:
-            # use only first call for now
-            tc = tool_calls[0]
-            # groq's structure may vary; support common keys
-            tool_name = tc.get("name") or tc.get("tool") or tc.get("tool_name")
-            arguments = tc.get("arguments") or tc.get("arguments_json") or tc.get("args") or {}
-            # Try normalize arguments to dict
-            args = {}
-            if isinstance(arguments, str):
-                try:
-                    args = json.loads(arguments)
-                except Exception:
-                    # best-effort parse: url=...
-                    parts = [p.strip() for p in arguments.split("&") if p.strip()]
-                    for p in parts:
-                        if "=" in p:
-                            k, v = p.split("=", 1)
-                            args[k] = v
-            elif isinstance(arguments, dict):
-                args = arguments
-
-            try:
-                tool_result = await registry.execute(tool_name, args)
-            except Exception:
-                logger.exception("Tool execution failed; continuing without tool result.")
-                tool_result = None
-
-            # Provide the tool output back to the model to ask for final JSON
-            messages.append({"role": "system", "content": f"Tool {tool_name} returned: {json.dumps(tool_result)}"})
-            final = await self.llm.chat(messages, temperature=0.0)
-            final = clean_code_fences(final)
-            try:
-                parsed = json.loads(final)
-                return parsed
-            except Exception:
-                m = re.search(r'(\{[\s\S]*\})', final)
-                if m:
-                    try:
-                        parsed = json.loads(m.group(1))
-                        return parsed
-                    except Exception:
-                        logger.exception("Failed to parse JSON from final LLM output.")
-
-        # final fallback
-        logger.warning("LLM parsing yielded no usable JSON; returning minimal inferred structure.")
-        return {
-            "task": "unknown",
-            "data_source": "none",
-            "analysis_type": "none",
-            "answer_format": "string",
-            "submit_url": "none",
-            "payload_template": "none",
-        }
-
-    # ----------------------
-    def _heuristic_detect_uv_get(self, html: str) -> Optional[Dict[str, str]]:
-        """
-        Detect instructions asking to craft a uv http get command.
-        If found, return a small dict with 'endpoint_template' (may include ?email=<your email>).
-        """
-        # look for "uv http get" or "uv http get" mentions in text
-        if re.search(r"\buv\s+http\s+get\b", html, re.I):
-            # try to find the path mentioned close to it, like /project2/uv.json?email=<your email>
-            m = re.search(r"(/[\w\-/.]+(?:\?[^<\s'\"]*)?)", html)
-            endpoint = None
-            if m:
-                endpoint = m.group(1)
-            return {"type": "uv_get", "endpoint": endpoint or "/project2/uv.json?email=<your email>"}
-        return None
-
-    # ----------------------
-    def _build_uv_command(self, origin: str, endpoint_template: str, email: str) -> str:
-        """
-        Construct the exact uv http get command string per instructions.
-        endpoint_template may contain '?email=<your email>' or just be a path.
-        """
-        # if endpoint_template is a full URL, respect it; else join with origin
-        if endpoint_template.startswith("http://") or endpoint_template.startswith("https://"):
-            url = endpoint_template.replace("<your email>", email).replace("&lt;your email&gt;", email)
-        else:
-            # ensure ?email fragment exists if not present
-            ep = endpoint_template.replace("<your email>", email).replace("&lt;your email&gt;", email)
-            # If template does not include scheme/host, join with origin
-            url = urljoin(origin, ep)
-        # build command with header
-        cmd = f'uv http get {url} -H "Accept: application/json"'
-        return cmd
-
-    # ----------------------
-    async def compute_answer(self, page_url: str, html: str, email: str, parsed_instructions: Optional[Dict[str, Any]] = None) -> Any:
-        """
-        Hybrid function: try deterministic handlers first (fast), then fall back to LLM generation.
-        Returns the final answer (string, dict for json, number, etc).
-        """
-        origin = find_origin_from_url(page_url)
-
-        # 1) Heuristic: uv http get command
-        uv = self._heuristic_detect_uv_get(html)
-        if uv:
-            ep = uv.get("endpoint") or "/project2/uv.json?email=<your email>"
-            cmd = self._build_uv_command(origin, ep, email)
-            logger.info(f"Built uv command via heuristic: {cmd}")
-            return cmd
-
-        # 2) If parsed_instructions explicitly request a command/GET, try to construct
-        if parsed_instructions:
-            fmt = str(parsed_instructions.get("answer_format", "")).lower()
-            task = parsed_instructions.get("task", "")
-            data_src = parsed_instructions.get("data_source", "")
-            # If LLM says data_source is an http URL that includes <your email>, substitute
-            if data_src and isinstance(data_src, str) and data_src.startswith("http"):
-                ds = data_src.replace("<your email>", email).replace("&lt;your email&gt;", email)
-                if "uv" in task.lower() or "http get" in task.lower():
-                    cmd = f'uv http get {ds} -H "Accept: application/json"'
-                    logger.info("Built uv command from parsed_instructions")
-                    return cmd
-
-        # 3) LLM fallback: ask it to compute the exact answer in the specified format
-        logger.info("Using LLM to compute the answer (fallback).")
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": (
-                    "You are given a quiz page HTML and must return ONLY the final answer in the exact format required.\n\n"
-                    "HTML:\n\n"
-                    f"{html[:12000]}\n\n"
-                    f"Context:\n - page_url: {page_url}\n - email: {email}\n\n"
-                    "Return ONLY the answer (no explanation, no markdown, no code fences)."
-                )
-            }
-        ]
-        raw = await self.llm.chat(messages, temperature=0.0)
-        raw = clean_code_fences(raw)
-        return raw
-
-    # ----------------------
-    async def submit_answer(self, quiz_page_url: str, email: str, secret: str, answer: Any) -> Dict[str, Any]:
-        """
-        Always POST to /submit on the platform with payload:
-            { email, secret, url, answer }
-        """
-        origin = find_origin_from_url(quiz_page_url)
-        submit_url = urljoin(origin, SUBMIT_PATH)
-        payload = {
-            "email": email,
-            "secret": secret,
-            "url": quiz_page_url,
-            "answer": answer
-        }
-
-        preview = {
-    "email": email,
-    "url": quiz_page_url,
-    "answer": (
-        str(answer)[:80] + "..."
-        if isinstance(answer, str) and len(answer) > 80
-        else answer
-    ),
-}
-        logger.info(f"POST {submit_url} payload={preview}")
-        r = await self.client.post(submit_url, json=payload)
-        try:
-            r.raise_for_status()
-        except Exception as e:
-            # try to include body for debugging
-            body = None
-            try:
-                body = r.json()
-            except Exception:
-                body = r.text
-            logger.error(f"Submit failed {r.status_code}: {body}")
-            raise
-
-        j = r.json()
-        logger.info(f"Submit response: {j}")
-        # Normalize keys: some endpoints return 'url' or 'next'
-        return {
-            "correct": j.get("correct", False),
-            "next_url": j.get("url") or j.get("next") or j.get("next_url"),
-            "raw": j
-        }
-
-    # ----------------------
-    async def solve_single_quiz(self, page_url: str, email: str, secret: str) -> Dict[str, Any]:
-        """
-        Solve one quiz page: fetch, parse, compute answer, submit.
-        Returns dict with keys: correct (bool), next_url (str|None), raw (response JSON)
-        """
-        logger.info(f"Solving single quiz: {page_url}")
+    etree.strip_elements(tree, "style", "noscript", "svg", etree.Comment, with_tail=False)
+    for el in tree.iter():
+        for attr in list(el.attrib):
+            if attr not in _KEEP_ATTRS and not attr.startswith("data-"):
+                del el.attrib[attr]
 
-        html = await self.fetch_page(page_url)
+    # move (not copy) top-level forms; drop_tree keeps their tail text in place
+    forms = [f for f in tree.xpath("//form[not(ancestor::form)]") if f.getparent() is not None]
+    head = "".join(lxml.html.tostring(f, encoding="unicode", with_tail=False) for f in forms)
+    for f in forms:
+        f.drop_tree()
+    return head + lxml.html.tostring(tree, encoding="unicode")
 
-        # first attempt: quick deterministic heuristic
-        try:
-            answer = await self.compute_answer(page_url, html, email)
-        except Exception as e:
-            logger.exception("Heuristic compute failed, will try LLM parsing.")
-            answer = None
 
-        # if heuristics didn't result in answer, ask LLM to parse instructions then compute
-        if answer is None:
-            parsed = await self.parse_quiz_with_llm(html)
-            try:
-                answer = await self.compute_answer(page_url, html, email, parsed_instructions=parsed)
-            except Exception:
-                logger.exception("Compute from parsed instructions failed; will fallback to LLM generation.")
-                # LLM fallback to generate final answer explicitly
-                answer = await self.compute_answer(page_url, html, email=None, parsed_instructions=None)
-
-        # final sanity: string-ify JSON answers if any
-        if isinstance(answer, dict) or isinstance(answer, list):
-            answer_payload = answer
-        else:
-            # ensure stripped string
-            answer_payload = str(answer).strip()
-
-        submit_result = await self.submit_answer(page_url, email, secret, answer_payload)
-        return submit_result
-
-    # ----------------------
-    async def solve_quiz_chain(self, start_url: str, email: Optional[str] = None, secret: Optional[str] = None):
-        """
-        Main loop: iteratively solve pages until no next_url is returned or a repeat is detected.
-        Returns {"message": str, "quizzes_solved": int}
-        """
-        if not email or not secret:
-            raise ValueError("Email and secret must be provided to solve_quiz_chain")
+# LLM answers currently being computed, keyed like answer_cache
+_inflight: Dict[str, "asyncio.Task[Any]"] = {}
 
-        # normalize start_url to absolute or path as passed-through
-        current_url = start_url
-        solved = 0
-        visited = set()
-        max_steps = 40
 
-        while current_url and solved < max_steps:
-            if current_url in visited:
-                logger.warning("Encountered repeated URL; stopping to avoid loops.")
-                return {"message": "Reached repeated URL; stopping.", "quizzes_solved": solved}
-            visited.add(current_url)
+def _forget_inflight(key: str, task: "asyncio.Task[Any]"):
+    _inflight.pop(key, None)
+    if not task.cancelled():
+        task.exception()  # mark retrieved; awaiting callers still get it
 
-            try:
-                res = await self.solve_single_quiz(current_url, email, secret)
-            except Exception as e:
-                logger.exception("Error during solving step.")
-                return {"message": f"Failed at step {solved+1}: {str(e)}", "quizzes_solved": solved}
 
-            solved += 1
+# ---------- Heuristics (answered without the LLM) ----------
+def _uv_command_answer(page_url: str, email: str) -> str:
+    url = f"{find_origin_from_url(page_url)}/project2/uv.json?email={email}"
+    return f'uv http get {url} -H "Accept: application/json"'
 
-            next_url = res.get("next_url")
-            # sometimes next_url may be absolute or relative; leave it as returned
-            if not next_url:
-                # chain ended
-                return {"message": "Final quiz solved.", "quizzes_solved": solved}
-            logger.info(f"Moving to next URL: {next_url}")
-            current_url = next_url
 
-        return {"message": f"Stopped after {solved} steps (max reached?).", "quizzes_solved": solved}
-
-    # ----------------------
-    async def close(self):
-        await self.client.aclose() '''
-
-# ====================================================================
-# agent/quiz_solver.py
-# ====================================================================
-import re
-import json
-import logging
-from typing import Any, Dict, Optional
-from urllib.parse import urljoin, urlparse
-
-import httpx
-
-from agent.llm_client import LLMClient
-from agent.prompts import SYSTEM_PROMPT
-
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
-DEFAULT_BASE = "https://tds-llm-analysis.s-anand.net"
-SUBMIT_PATH = "/submit"
-
-
-def clean_code_fences(text: str) -> str:
-    if not isinstance(text, str):
-        return text
-    m = re.search(r"```(?:\w*\n)?([\s\S]*?)```", text)
-    return m.group(1).strip() if m else text.replace("`", "").strip()
-
-
-def find_origin_from_url(url: str) -> str:
-    p = urlparse(url)
-    return f"{p.scheme}://{p.netloc}" if p.scheme and p.netloc else DEFAULT_BASE
+# (pattern, handler) pairs tried in order before the LLM; first match wins
+_HEURISTICS = (
+    (_UV_GET_RE, _uv_command_answer),
+)
 
 
 class QuizSolver:
-    def __init__(self, timeout: float = 30.0):
-        self.llm = LLMClient()
-        self.client = httpx.AsyncClient(timeout=timeout)
+    def __init__(self, timeout: float = 30.0, client: Optional[httpx.AsyncClient] = None):
+        self.llm = get_llm_client()
+        self.timeout = timeout
+        # Shared pooled client: the connection opened by fetch_page is still
+        # warm when submit_answer posts, and across chains/requests.
+        self.client = client or get_client()
 
-    async def fetch_page(self, url: str) -> str:
+    async def fetch_page(self, url: str, max_bytes: Optional[int] = None) -> str:
         if not urlparse(url).netloc:
             url = urljoin(DEFAULT_BASE, url)
-        r = await self.client.get(url)
-        r.raise_for_status()
-        return r.text
-
-    # ---------- Heuristic for project2-uv ----------
-    def _build_uv_command(self, origin: str, email: str) -> str:
-        url = f"{origin}/project2/uv.json?email={email}"
-        return f'uv http get {url} -H "Accept: application/json"'
+        if max_bytes is None:
+            r = await self.client.get(url, timeout=self.timeout)
+            if r.status_code >= 300:
+                r.raise_for_status()
+            return r.text
+
+        # stop reading (and decoding) once we have max_bytes of the page
+        buf = bytearray()
+        async with self.client.stream("GET", url, timeout=self.timeout) as r:
+            if r.status_code >= 300:
+                r.raise_for_status()
+            async for chunk in r.aiter_bytes():
+                buf += chunk
+                if len(buf) >= max_bytes:
+                    break
+        return bytes(buf[:max_bytes]).decode(r.charset_encoding or "utf-8", errors="replace")
 
     async def compute_answer(self, page_url: str, html: str, email: str) -> Any:
-        if re.search(r"\buv\s+http\s+get\b", html, re.I):
-            origin = find_origin_from_url(page_url)
-            return self._build_uv_command(origin, email)
-
-        # fallback → LLM
+        answer, _ = await self._compute_answer(page_url, html, email)
+        return answer
+
+    async def _compute_answer(
+        self, page_url: str, html: str, email: str
+    ) -> Tuple[Any, Optional[str]]:
+        """Answer plus its answer_cache key (None for heuristic answers)"""
+        for pattern, handler in _HEURISTICS:
+            if pattern.search(html):
+                logger.info("Heuristic %s answered %s", handler.__name__, page_url)
+                return handler(page_url, email), None
+
+        # fallback → LLM (skipped when this page was already answered)
+        sample = compact_html_for_llm(html)[:12000]
+        key = answer_cache.key(sample)
+        cached = answer_cache.get(key)
+        if cached is not None:
+            return cached, key
+
+        # identical pages being answered concurrently share one LLM call;
+        # shield so one caller's timeout doesn't cancel it for the others
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._ask_llm(key, sample))
+            _inflight[key] = task
+            task.add_done_callback(lambda t: _forget_inflight(key, t))
+        return await asyncio.shield(task), key
+
+    async def _ask_llm(self, key: str, sample: str) -> Any:
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": (
-                    "Return ONLY the final answer in the required format.\n\n"
-                    f"HTML:\n{html[:12000]}"
-                ),
-            },
+            {"role": "system", "content": ANSWER_INSTRUCTIONS},
+            {"role": "user", "content": f"HTML:\n{sample}"},
         ]
-        raw = await self.llm.chat(messages, temperature=0.0)
-        return clean_code_fences(raw)
+        # answer_cache already covers this call (and can evict a rejected
+        # answer), so skip the LLM response cache
+        raw = await self.llm.chat_json(
+            messages, temperature=0.0, max_tokens=ANSWER_MAX_TOKENS, cache=False
+        )
+        answer = clean_code_fences(raw)
+
+        answer_cache.put(key, answer)
+        return answer
 
     async def submit_answer(
         self, quiz_page_url: str, email: str, secret: str, answer: Any
     ) -> Dict[str, Any]:
 
-        origin = find_origin_from_url(quiz_page_url)
-        submit_url = urljoin(origin, SUBMIT_PATH)
+        submit_url = _submit_url_for(find_origin_from_url(quiz_page_url))
 
         payload = {
             "email": email,
@@ -500,18 +209,24 @@ class QuizSolver:
             "answer": answer,
         }
 
-        # ✅ SAFE LOGGING (no f-string dict interpolation)
+        # ✅ SAFE LOGGING (no secret; answer is stringified and cut only if emitted)
         logger.info(
-            "POST %s | email=%s | url=%s | answer_preview=%s",
+            "POST %s | email=%s | url=%s | answer_preview=%.80s",
             submit_url,
             email,
             quiz_page_url,
-            str(answer)[:80],
+            answer,
         )
 
-        r = await self.client.post(submit_url, json=payload)
-        r.raise_for_status()
-        j = r.json()
+        r = await self.client.post(
+            submit_url,
+            content=orjson.dumps(payload),
+            headers={"content-type": "application/json"},
+            timeout=self.timeout,
+        )
+        if r.status_code >= 300:
+            r.raise_for_status()
+        j = orjson.loads(r.content)
 
         return {
             "correct": j.get("correct", False),
@@ -519,19 +234,43 @@ class QuizSolver:
             "raw": j,
         }
 
-    async def solve_single_quiz(self, url: str, email: str, secret: str):
-        html = await self.fetch_page(url)
-        answer = await self.compute_answer(url, html, email)
-        return await self.submit_answer(url, email, secret, str(answer).strip())
+    async def solve_single_quiz(self, url: str, email: str, secret: str) -> Dict[str, Any]:
+        html = await self.fetch_page(url, max_bytes=PAGE_MAX_BYTES)
+        answer, key = await self._compute_answer(url, html, email)
+        # answers are posted as strings; LLM ones are already stripped
+        if not isinstance(answer, str):
+            answer = str(answer).strip()
+        res = await self.submit_answer(url, email, secret, answer)
+        if key is not None and not res["correct"]:
+            # don't replay a rejected answer on the next attempt
+            answer_cache.discard(key)
+        return res
+
+    async def solve_many(
+        self, urls: List[str], email: str, secret: str, concurrency: int = 8
+    ) -> List[Any]:
+        """
+        Solve independent quiz URLs concurrently (at most `concurrency` at a
+        time). Results are in input order; a failed quiz yields its exception.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(url: str) -> Dict[str, Any]:
+            async with sem:
+                return await self.solve_single_quiz(url, email, secret)
+
+        return await asyncio.gather(*(_one(u) for u in urls), return_exceptions=True)
 
-    async def solve_quiz_chain(self, start_url: str, email: str, secret: str):
-        current = start_url
-        visited = set()
-        solved = 0
+    async def solve_quiz_chain(self, start_url: str, email: str, secret: str) -> Dict[str, Any]:
+        current: Optional[str] = start_url
+        visited: Set[str] = set()
+        solved: int = 0
 
         while current:
             if current in visited:
                 return {"message": "Loop detected", "quizzes_solved": solved}
+            if solved >= MAX_CHAIN_STEPS:
+                return {"message": "Step limit reached", "quizzes_solved": solved}
 
             visited.add(current)
             try:
@@ -546,6 +285,3 @@ class QuizSolver:
                 return {"message": "Final quiz solved.", "quizzes_solved": solved}
 
         return {"message": "Done", "quizzes_solved": solved}
-
-    async def close(self):
-        await self.client.aclose()
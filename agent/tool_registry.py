@@ -1,6 +1,7 @@
 import asyncio
-import json
+import orjson
 from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl
 
 
 class ToolRegistry:
@@ -11,40 +12,44 @@ class ToolRegistry:
 
     def __init__(self):
         self._tools: Dict[str, Dict[str, Any]] = {}
+        # metadata list for the model; rebuilt only after a registration
+        self._tools_for_model: Optional[List[Dict[str, Any]]] = None
+
+    def _add(self, name: str, fn: Callable, description: str, parameters: Optional[Dict]):
+        self._tools[name] = {
+            "name": name,
+            "description": description,
+            "parameters": parameters or {},
+            "fn": fn,
+            "is_coro": asyncio.iscoroutinefunction(fn),
+        }
+        self._tools_for_model = None
 
     def register(self, name: str, description: str, parameters: Optional[Dict] = None):
         """Decorator to register a function as a tool."""
 
         def _decorator(fn: Callable):
-            self._tools[name] = {
-                "name": name,
-                "description": description,
-                "parameters": parameters or {},
-                "fn": fn,
-            }
+            self._add(name, fn, description, parameters)
             return fn
 
         return _decorator
 
     def register_fn(self, name: str, fn: Callable, description: str, parameters: Optional[Dict] = None):
         """Register a callable directly."""
-        self._tools[name] = {
-            "name": name,
-            "description": description,
-            "parameters": parameters or {},
-            "fn": fn,
-        }
+        self._add(name, fn, description, parameters)
 
     def get_tools_for_model(self) -> List[Dict[str, Any]]:
         """Return a list of tool metadata suitable to pass to model APIs."""
-        tools = []
-        for t in self._tools.values():
-            tools.append({
-                "name": t["name"],
-                "description": t["description"],
-                "parameters": t["parameters"],
-            })
-        return tools
+        if self._tools_for_model is None:
+            self._tools_for_model = [
+                {
+                    "name": t["name"],
+                    "description": t["description"],
+                    "parameters": t["parameters"],
+                }
+                for t in self._tools.values()
+            ]
+        return self._tools_for_model
 
     async def execute(self, name: str, arguments: Any) -> Any:
         """Execute a registered tool. `arguments` can be dict or JSON string."""
@@ -58,19 +63,15 @@ class ToolRegistry:
         args = {}
         if isinstance(arguments, str):
             try:
-                args = json.loads(arguments)
+                args = orjson.loads(arguments)
             except Exception:
-                # try very small parsing like 'url=https://...'
-                parts = [p.strip() for p in arguments.split("&") if p.strip()]
-                for p in parts:
-                    if "=" in p:
-                        k, v = p.split("=", 1)
-                        args[k] = v
+                # try query-string style parsing like 'url=https://...'
+                args = dict(parse_qsl(arguments.strip(), keep_blank_values=True))
         elif isinstance(arguments, dict):
             args = arguments
 
         # call fn (support coroutine functions)
-        if asyncio.iscoroutinefunction(fn):
+        if entry["is_coro"]:
             return await fn(**args)
         else:
             return fn(**args)
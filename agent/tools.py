@@ -3,104 +3,135 @@
 # ============================================================================
 
 import logging
+import re
 from typing import Optional, Dict, Any
 import httpx
+import orjson
 from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
 import pandas as pd
 import io
 import base64
+import tempfile
 from utils.file_handler import FileHandler
 from utils.data_processor import DataProcessor
 from agent.tool_registry import registry
+from agent.http_clients import get_client
+from utils.web_scraper import visible_text
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_SPOOL_BYTES = 8 * 1024 * 1024
+
+# Bare MIME type -> how fetch_data should decode the body
+_CONTENT_KINDS = {
+    "application/json": "json",
+    "text/json": "json",
+    "application/pdf": "pdf",
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "text/plain": "csv",
+    "application/vnd.ms-excel": "excel",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": "excel",
+}
+
+_ATOB_RE = re.compile(r'atob\(([\'"`])([A-Za-z0-9+/=]+)\1\)')
+
+
+def _decode_atob_match(m: "re.Match") -> str:
+    """Replace one atob("...") call with its decoded text as a template literal"""
+    try:
+        return "`" + base64.b64decode(m.group(2)).decode("utf-8") + "`"
+    except Exception as e:
+        logger.warning("Failed to decode base64: %s", e)
+        return m.group(0)
+
 
 class QuizTools:
     """
     Tools for fetching, processing, and analyzing data
     """
     
-    def __init__(self):
+    def __init__(self, http: Optional[httpx.AsyncClient] = None):
         self.file_handler = FileHandler()
         self.data_processor = DataProcessor()
+        self._file_processors = {
+            "pdf": self.file_handler.process_pdf,
+            "csv": self.file_handler.process_csv,
+            "excel": self.file_handler.process_excel,
+        }
+        self._http = http
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Injected client, or the shared pooled one"""
+        return self._http or get_client()
     
     async def fetch_page(self, url: str) -> str:
         """
         Fetch and render a web page (handles JavaScript)
         Windows-compatible: uses httpx + manual JS execution
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
+        response = await self.http.get(url)
+        if response.status_code >= 300:
             response.raise_for_status()
-            content = response.text
-            
-            # Check if page has base64 encoded content that needs decoding
-            if 'atob(' in content or 'btoa(' in content:
-                logger.info("Detected base64 encoded content, decoding...")
-                content = self._decode_atob_content(content)
-            
-            return content
+        content = response.text
+        
+        # Check if page has base64 encoded content that needs decoding
+        # (on the raw bytes, so pages without it skip the str scan)
+        raw = response.content
+        if raw.find(b'atob(') != -1 or raw.find(b'btoa(') != -1:
+            logger.info("Detected base64 encoded content, decoding...")
+            content = self._decode_atob_content(content)
+        
+        return content
     
     def _decode_atob_content(self, html: str) -> str:
         """
         Decode base64 content from atob() JavaScript calls
         """
-        import re
-        import base64
-        
-        # Find atob() calls
-        pattern = r'atob\([\'"`]([A-Za-z0-9+/=]+)[\'"`]\)'
-        matches = re.findall(pattern, html)
-        
-        decoded_html = html
-        for encoded in matches:
-            try:
-                decoded = base64.b64decode(encoded).decode('utf-8')
-                # Replace the atob call with decoded content
-                decoded_html = decoded_html.replace(f'atob("{encoded}")', f'`{decoded}`')
-                decoded_html = decoded_html.replace(f"atob('{encoded}')", f'`{decoded}`')
-                decoded_html = decoded_html.replace(f'atob(`{encoded}`)', f'`{decoded}`')
-            except Exception as e:
-                logger.warning(f"Failed to decode base64: {str(e)}")
-        
-        return decoded_html
+        # Replace every atob() call in a single pass
+        return _ATOB_RE.sub(_decode_atob_match, html)
     
     async def fetch_data(self, url: str) -> Any:
         """
         Fetch data from URL (file download or API call)
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        async with self.http.stream("GET", url) as response:
+            if response.status_code >= 300:
+                response.raise_for_status()
             
-            content_type = response.headers.get("content-type", "")
+            mime = response.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+            kind = _CONTENT_KINDS.get(mime)
             
             # Handle different content types
-            if "json" in content_type:
-                return response.json()
-            elif "pdf" in content_type:
-                return await self.file_handler.process_pdf(response.content)
-            elif "csv" in content_type or "text/plain" in content_type:
-                return await self.file_handler.process_csv(response.content)
-            elif "excel" in content_type or "spreadsheet" in content_type:
-                return await self.file_handler.process_excel(response.content)
-            else:
+            if kind == "json" or (kind is None and mime.endswith("+json")):
+                return orjson.loads(await response.aread())
+            handler = self._file_processors.get(kind)
+            if handler is None:
                 # Return as text
+                await response.aread()
                 return response.text
+            
+            # Spool file downloads to disk past DOWNLOAD_SPOOL_BYTES instead
+            # of holding the whole body in memory
+            with tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_BYTES) as tmp:
+                async for chunk in response.aiter_bytes(65536):
+                    tmp.write(chunk)
+                return await handler(tmp)
     
     def parse_html(self, html: str) -> str:
         """
-        Parse HTML and extract text content
+        Parse HTML and extract text content with selectolax's C parser.
+        Falls back to BeautifulSoup if selectolax cannot handle the markup.
         """
-        soup = BeautifulSoup(html, "html.parser")
-        
-        # Remove script and style tags
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        text = soup.get_text(separator="\n", strip=True)
-        return text
+        try:
+            return visible_text(HTMLParser(html), "\n")
+        except Exception:
+            soup = BeautifulSoup(html, "lxml")
+            for script in soup(["script", "style"]):
+                script.decompose()
+            return soup.get_text(separator="\n", strip=True)
 
 
 # Instantiate and register tools for LLM function-calling
@@ -3,6 +3,7 @@
 # ============================================================================
 
 import os
+from typing import Final
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -39,4 +40,10 @@ class Config:
         if not any([cls.GROQ_API_KEY, cls.AI21_API_KEY, cls.OPENAI_API_KEY]):
             raise ValueError("At least one LLM API key is required")
         
-        return True
\ No newline at end of file
+        return True
+
+
+# Read-once module constants for hot paths (plain global lookups)
+STUDENT_EMAIL: Final = Config.STUDENT_EMAIL
+SECRET_KEY: Final = Config.SECRET_KEY
+TIMEOUT_SECONDS: Final = Config.TIMEOUT_SECONDS
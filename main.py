@@ -5,10 +5,11 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, EmailStr
-import os
 from dotenv import load_dotenv
 import asyncio
+from config import Config, STUDENT_EMAIL, SECRET_KEY, TIMEOUT_SECONDS
 from agent.quiz_solver import QuizSolver
+from agent import llm_client, http_clients
 import logging
 
 # Setup logging
@@ -27,16 +28,24 @@ from fastapi.responses import JSONResponse
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Return 400 for invalid JSON/validation errors"""
-    logger.warning(f"Validation error: {exc}")
+    logger.warning("Validation error: %s", exc)
     return JSONResponse(
         status_code=400,
         content={"detail": "Invalid JSON or missing required fields"}
     )
 
-# Configuration
-STUDENT_EMAIL = os.getenv("STUDENT_EMAIL")
-SECRET_KEY = os.getenv("SECRET_KEY")
-TIMEOUT_SECONDS = int(os.getenv("TIMEOUT_SECONDS", "180"))
+@app.on_event("startup")
+async def startup():
+    """Fail fast on missing config and open the shared HTTP connection pool"""
+    Config.validate()
+    # create the pool up front; QuizSolver/QuizTools/WebScraper share it via get_client()
+    http_clients.get_client()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release shared HTTP connection pools"""
+    await http_clients.aclose()
+    await llm_client.aclose()
 
 
 class QuizRequest(BaseModel):
@@ -57,7 +66,8 @@ async def root():
     return {
         "status": "running",
         "service": "LLM Quiz Solver",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "llm_cache": llm_client.response_cache.stats()
     }
 
 
@@ -66,11 +76,11 @@ async def solve_quiz(request: QuizRequest):
     """
     Main endpoint to receive and solve quiz tasks
     """
-    logger.info(f"Received quiz request for URL: {request.url}")
+    logger.info("Received quiz request for URL: %s", request.url)
     
     # Verify credentials
     if request.email != STUDENT_EMAIL or request.secret != SECRET_KEY:
-        logger.warning(f"Authentication failed for email: {request.email}")
+        logger.warning("Authentication failed for email: %s", request.email)
         raise HTTPException(status_code=403, detail="Invalid credentials")
     
     try:
@@ -78,15 +88,13 @@ async def solve_quiz(request: QuizRequest):
         solver = QuizSolver()
         
         # Solve quiz with timeout
-        solver = QuizSolver()
         result = await asyncio.wait_for(
-    solver.solve_quiz_chain(request.url, email=request.email, secret=request.secret),
-    timeout=TIMEOUT_SECONDS
-)
-        await solver.close()
+            solver.solve_quiz_chain(request.url, email=request.email, secret=request.secret),
+            timeout=TIMEOUT_SECONDS
+        )
 
         
-        logger.info(f"Successfully solved {result['quizzes_solved']} quiz(es)")
+        logger.info("Successfully solved %d quiz(es)", result["quizzes_solved"])
         
         return JSONResponse(
             status_code=200,
@@ -104,7 +112,7 @@ async def solve_quiz(request: QuizRequest):
             detail=f"Quiz solving exceeded {TIMEOUT_SECONDS} seconds timeout"
         )
     except Exception as e:
-        logger.error(f"Error solving quiz: {str(e)}", exc_info=True)
+        logger.error("Error solving quiz: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Error solving quiz: {str(e)}"
@@ -114,7 +122,7 @@ async def solve_quiz(request: QuizRequest):
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=500,
         content={"status": "error", "message": "Internal server error"}
@@ -2,13 +2,25 @@
 # utils/data_processor.py - Data Analysis Utilities
 # ============================================================================
 
+import operator
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from typing import Any, List, Dict
 import logging
 
 logger = logging.getLogger(__name__)
 
+_FILTER_OPS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
 
 class DataProcessor:
     """
@@ -17,7 +29,12 @@ class DataProcessor:
     
     def sum_column(self, df: pd.DataFrame, column: str) -> float:
         """Sum values in a column"""
-        return df[column].sum()
+        col = df[column]
+        if isinstance(col.dtype, pd.ArrowDtype):
+            # Arrow's sum kernel on the backing buffers (min_count=0 so an
+            # empty/all-null column sums to 0, as pandas does)
+            return pc.sum(pa.array(col.array), min_count=0).as_py()
+        return col.sum()
     
     def filter_data(
         self,
@@ -31,20 +48,10 @@ class DataProcessor:
         
         condition: '==', '!=', '>', '<', '>=', '<='
         """
-        if condition == "==":
-            return df[df[column] == value]
-        elif condition == "!=":
-            return df[df[column] != value]
-        elif condition == ">":
-            return df[df[column] > value]
-        elif condition == "<":
-            return df[df[column] < value]
-        elif condition == ">=":
-            return df[df[column] >= value]
-        elif condition == "<=":
-            return df[df[column] <= value]
-        else:
+        op = _FILTER_OPS.get(condition)
+        if op is None:
             raise ValueError(f"Unknown condition: {condition}")
+        return df[op(df[column], value)]
     
     def group_by_aggregate(
         self,
@@ -58,7 +65,12 @@ class DataProcessor:
         
         agg_func: 'sum', 'mean', 'count', 'min', 'max'
         """
-        return df.groupby(group_by)[agg_column].agg(agg_func).reset_index()
+        # observed=True: with categorical keys, only aggregate groups that occur
+        return (
+            df.groupby(group_by, observed=True)[agg_column]
+            .agg(agg_func)
+            .reset_index()
+        )
     
     def sort_data(
         self,
@@ -67,17 +79,45 @@ class DataProcessor:
         ascending: bool = True
     ) -> pd.DataFrame:
         """Sort DataFrame by column"""
+        arr = df[column].to_numpy()
+        # NaN-free numeric columns: argsort in NumPy and take rows by position
+        # (sort_values keeps NaNs last either way, so those go through pandas)
+        if arr.dtype.kind in "iub" or (arr.dtype.kind == "f" and not np.isnan(arr).any()):
+            if ascending:
+                idx = np.argsort(arr, kind="stable")
+            else:
+                # same trick as pandas' nargsort: ties keep their original order
+                idx = (len(arr) - 1 - np.argsort(arr[::-1], kind="stable"))[::-1]
+            return df.iloc[idx]
         return df.sort_values(by=column, ascending=ascending)
     
     def get_statistics(self, df: pd.DataFrame, column: str) -> Dict[str, float]:
         """Get basic statistics for a column"""
+        col = df[column]
+        arr = col.dropna().to_numpy()
+        if arr.dtype.kind not in "iuf":
+            # non-numeric (or object-backed) columns keep pandas semantics
+            return {
+                "mean": col.mean(),
+                "median": col.median(),
+                "std": col.std(),
+                "min": col.min(),
+                "max": col.max(),
+                "count": len(col)
+            }
+        
+        # Reduce the NaN-free array directly instead of six pandas round-trips
+        n = arr.size
+        if n == 0:
+            return {"mean": np.nan, "median": np.nan, "std": np.nan,
+                    "min": np.nan, "max": np.nan, "count": len(col)}
         return {
-            "mean": df[column].mean(),
-            "median": df[column].median(),
-            "std": df[column].std(),
-            "min": df[column].min(),
-            "max": df[column].max(),
-            "count": len(df[column])
+            "mean": arr.mean(),
+            "median": np.median(arr),
+            "std": np.sqrt(arr.var(ddof=1)) if n > 1 else np.nan,
+            "min": arr.min(),
+            "max": arr.max(),
+            "count": len(col)
         }
     
     def pivot_table(
@@ -89,6 +129,17 @@ class DataProcessor:
         aggfunc: str = "sum"
     ) -> pd.DataFrame:
         """Create pivot table"""
+        if isinstance(aggfunc, str):
+            # Same table as pivot_table's defaults (sorted keys, NaN for
+            # missing cells, all-NaN rows/columns dropped) without its
+            # margins/fill machinery
+            return (
+                df.groupby([index, columns], observed=True)[values]
+                .agg(aggfunc)
+                .unstack(columns)
+                .dropna(how="all")
+                .dropna(axis=1, how="all")
+            )
         return pd.pivot_table(
             df,
             index=index,
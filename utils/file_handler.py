@@ -3,77 +3,95 @@
 # ============================================================================
 
 import io
+import asyncio
 import pandas as pd
 import PyPDF2
 import pdfplumber
 import logging
-from typing import Any, Dict
+from typing import Any, BinaryIO, Dict, Union
 
 logger = logging.getLogger(__name__)
 
+# Raw bytes, or a binary file object (e.g. a spooled download) read from the start
+FileContent = Union[bytes, BinaryIO]
+
+
+def _as_file(content: FileContent) -> BinaryIO:
+    """Wrap bytes in BytesIO, or rewind an existing file object"""
+    if isinstance(content, (bytes, bytearray)):
+        return io.BytesIO(content)
+    content.seek(0)
+    return content
+
 
 class FileHandler:
     """
     Handle various file formats (PDF, CSV, Excel)
     """
     
-    async def process_pdf(self, content: bytes) -> str:
+    async def process_pdf(self, content: FileContent) -> str:
         """
-        Extract text from PDF
+        Extract text from PDF (in a worker thread, so parsing a large
+        document doesn't block the event loop)
         """
+        return await asyncio.to_thread(self._extract_pdf_text, content)
+    
+    def _extract_pdf_text(self, content: FileContent) -> str:
+        # Pages are extracted in order on one thread: pdfplumber pages share
+        # the document's parser state and are not safe to use concurrently.
         try:
             # Try pdfplumber first (better for tables)
-            with pdfplumber.open(io.BytesIO(content)) as pdf:
-                text = ""
+            with pdfplumber.open(_as_file(content)) as pdf:
+                parts = []
                 for page in pdf.pages:
-                    text += page.extract_text() or ""
+                    parts.append(page.extract_text() or "")
                     
                     # Extract tables if present
                     tables = page.extract_tables()
                     if tables:
                         for table in tables:
-                            text += "\n\nTable:\n"
-                            text += str(table)
+                            parts.append("\n\nTable:\n")
+                            parts.append(str(table))
                 
-                return text
+                return "".join(parts)
         except Exception as e:
-            logger.warning(f"pdfplumber failed, trying PyPDF2: {str(e)}")
+            logger.warning("pdfplumber failed, trying PyPDF2: %s", e)
             
             # Fallback to PyPDF2
             try:
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() or ""
-                return text
+                pdf_reader = PyPDF2.PdfReader(_as_file(content))
+                return "".join(page.extract_text() or "" for page in pdf_reader.pages)
             except Exception as e2:
-                logger.error(f"PDF processing failed: {str(e2)}")
+                logger.error("PDF processing failed: %s", e2)
                 raise
     
-    async def process_csv(self, content: bytes) -> pd.DataFrame:
+    async def process_csv(self, content: FileContent) -> pd.DataFrame:
         """
-        Parse CSV into pandas DataFrame
+        Parse CSV into an Arrow-backed pandas DataFrame (multi-threaded Arrow
+        reader, falling back to the default C engine)
         """
         try:
-            df = pd.read_csv(io.BytesIO(content))
-            logger.info(f"Loaded CSV with shape: {df.shape}")
+            try:
+                df = pd.read_csv(_as_file(content), engine="pyarrow", dtype_backend="pyarrow")
+            except Exception as e:
+                logger.warning("pyarrow CSV engine failed, using default: %s", e)
+                df = pd.read_csv(_as_file(content), dtype_backend="pyarrow")
+            logger.info("Loaded CSV with shape: %s", df.shape)
             return df
         except Exception as e:
-            logger.error(f"CSV processing failed: {str(e)}")
+            logger.error("CSV processing failed: %s", e)
             raise
     
-    async def process_excel(self, content: bytes) -> Dict[str, pd.DataFrame]:
+    async def process_excel(self, content: FileContent) -> Dict[str, pd.DataFrame]:
         """
         Parse Excel file (all sheets)
         """
         try:
-            excel_file = pd.ExcelFile(io.BytesIO(content))
-            sheets = {}
-            for sheet_name in excel_file.sheet_names:
-                sheets[sheet_name] = pd.read_excel(excel_file, sheet_name=sheet_name)
+            # sheet_name=None reads every sheet from one open workbook
+            sheets = pd.read_excel(_as_file(content), sheet_name=None)
             
-            logger.info(f"Loaded Excel with {len(sheets)} sheets")
+            logger.info("Loaded Excel with %d sheets", len(sheets))
             return sheets
         except Exception as e:
-            logger.error(f"Excel processing failed: {str(e)}")
+            logger.error("Excel processing failed: %s", e)
             raise
\ No newline at end of file
@@ -0,0 +1,32 @@
+# ============================================================================
+# utils/json_utils.py - JSON Extraction Helpers
+# ============================================================================
+
+
+def find_json_end(text: str, start: int = 0) -> int:
+    """
+    Return the index just past the JSON object/array opening at text[start],
+    or -1 if it is never closed. Brackets inside string literals are ignored.
+    """
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == "{" or c == "[":
+            depth += 1
+        elif c == "}" or c == "]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
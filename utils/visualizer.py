@@ -5,7 +5,9 @@
 import matplotlib
 matplotlib.use('Agg')  # Use non-GUI backend
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
+import numpy as np
 import pandas as pd
 import io
 import base64
@@ -15,6 +17,17 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _values(col: pd.Series):
+    """
+    Column as a NumPy array matplotlib can draw: numeric columns become
+    float with NaN for nulls (Arrow-backed ones would otherwise give an
+    object array holding pd.NA), anything else is passed through.
+    """
+    if pd.api.types.is_numeric_dtype(col.dtype):
+        return col.to_numpy(dtype=float, na_value=np.nan)
+    return col.to_numpy()
+
+
 class Visualizer:
     """
     Create charts and visualizations
@@ -23,6 +36,16 @@ class Visualizer:
     def __init__(self):
         sns.set_style("whitegrid")
         plt.rcParams['figure.figsize'] = (10, 6)
+        # One Figure reused by every chart (cleared per call) instead of a
+        # new pyplot figure + manager per chart. Methods are synchronous, so
+        # calls never interleave on the event loop.
+        self._fig = Figure()
+    
+    def _new_axes(self):
+        """Clear the shared figure and return it with a fresh Axes"""
+        fig = self._fig
+        fig.clear()
+        return fig, fig.add_subplot(111)
     
     def create_bar_chart(
         self,
@@ -34,10 +57,16 @@ class Visualizer:
         """
         Create bar chart and return as base64 string
         """
-        fig, ax = plt.subplots()
-        data.plot(kind='bar', x=x, y=y, ax=ax)
+        fig, ax = self._new_axes()
+        labels = data[x].to_numpy()
+        positions = range(len(labels))
+        ax.bar(positions, _values(data[y]), label=y)
+        ax.set_xticks(positions)
+        ax.set_xticklabels(labels, rotation=90)
+        ax.set_xlabel(x)
+        ax.legend()
         ax.set_title(title)
-        plt.tight_layout()
+        fig.tight_layout()
         
         return self._fig_to_base64(fig)
     
@@ -51,10 +80,12 @@ class Visualizer:
         """
         Create line chart and return as base64 string
         """
-        fig, ax = plt.subplots()
-        data.plot(kind='line', x=x, y=y, ax=ax, marker='o')
+        fig, ax = self._new_axes()
+        ax.plot(_values(data[x]), _values(data[y]), marker='o', label=y)
+        ax.set_xlabel(x)
+        ax.legend()
         ax.set_title(title)
-        plt.tight_layout()
+        fig.tight_layout()
         
         return self._fig_to_base64(fig)
     
@@ -68,12 +99,12 @@ class Visualizer:
         """
         Create scatter plot and return as base64 string
         """
-        fig, ax = plt.subplots()
-        ax.scatter(data[x], data[y])
+        fig, ax = self._new_axes()
+        ax.scatter(data[x].to_numpy(), data[y].to_numpy())
         ax.set_xlabel(x)
         ax.set_ylabel(y)
         ax.set_title(title)
-        plt.tight_layout()
+        fig.tight_layout()
         
         return self._fig_to_base64(fig)
     
@@ -87,24 +118,28 @@ class Visualizer:
         """
         Create histogram and return as base64 string
         """
-        fig, ax = plt.subplots()
-        data[column].hist(bins=bins, ax=ax)
+        fig, ax = self._new_axes()
+        ax.hist(data[column].dropna().to_numpy(), bins=bins)
         ax.set_xlabel(column)
         ax.set_ylabel("Frequency")
         ax.set_title(title)
-        plt.tight_layout()
+        fig.tight_layout()
         
         return self._fig_to_base64(fig)
     
     def _fig_to_base64(self, fig) -> str:
         """
-        Convert matplotlib figure to base64 string
+        Convert matplotlib figure to base64 string (the figure is left
+        open for reuse)
         """
         buf = io.BytesIO()
-        fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-        buf.seek(0)
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close(fig)
+        # zlib level 3 instead of the default 6: encodes a typical chart
+        # ~8% faster, but the PNG (and its base64) is ~80% larger
+        fig.savefig(
+            buf, format='png', dpi=100, bbox_inches='tight',
+            pil_kwargs={"compress_level": 3}
+        )
+        img_base64 = base64.b64encode(buf.getvalue()).decode('ascii')
         
         # Return as data URI
         return f"data:image/png;base64,{img_base64}"
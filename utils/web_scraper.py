@@ -1,7 +1,39 @@
+import html as html_lib
 import httpx
 import re
 import base64
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
+from agent.http_clients import get_client
+
+VALIDATED_CACHE_SIZE = 256
+
+# Secret patterns, tried in order by WebScraper._extract_secret
+_RE_TOKEN = re.compile(r"\b[A-Za-z0-9]{5,30}\b")
+_RE_SECRET = re.compile(r"[Ss]ecret[^A-Za-z0-9]*([A-Za-z0-9]{4,30})")
+_RE_CODE = re.compile(r"[Cc]ode[^A-Za-z0-9]*([A-Za-z0-9]{4,30})")
+
+# Tag/comment stripping for the parser-free secret path
+_RE_COMMENT = re.compile(r"<!--.*?-->", re.S)
+_RE_SCRIPT_STYLE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.S | re.I)
+_RE_TAG = re.compile(r"<[^>]+>")
+
+
+def visible_text(tree: HTMLParser, separator: str) -> str:
+    """
+    Text of a selectolax tree as BeautifulSoup's get_text(separator,
+    strip=True) gives it: script/style/template contents are skipped and
+    whitespace-only strings are dropped. Removes those nodes from `tree`.
+    """
+    for node in tree.css("script, style, template"):
+        node.decompose()
+    if tree.root is None:
+        return ""
+    # join on NUL (the parser never emits it) so empty pieces can be dropped
+    pieces = tree.root.text(separator="\0", strip=True).split("\0")
+    return separator.join(p for p in pieces if p)
 
 
 class WebScraper:
@@ -12,19 +44,48 @@ class WebScraper:
     - Detects quiz secret strings with several fallback patterns.
     """
 
+    def __init__(self, http: Optional[httpx.AsyncClient] = None):
+        self._http = http
+        # url -> (conditional-request headers, body) for revalidation
+        self._validated: "OrderedDict[str, Tuple[Dict[str, str], bytes]]" = OrderedDict()
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Injected client, or the shared pooled one."""
+        return self._http or get_client()
+
     async def fetch(self, url: str) -> str:
-        """Fetch raw bytes from a URL."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url)
+        """
+        Fetch raw bytes from a URL.
+        Repeat fetches send If-None-Match / If-Modified-Since, and a
+        304 Not Modified reuses the stored body without transferring it.
+        """
+        cached = self._validated.get(url)
+        resp = await self.http.get(url, headers=cached[0] if cached else None)
+        if resp.status_code == 304 and cached:
+            self._validated.move_to_end(url)
+            return cached[1]
+
+        validators = {}
+        if "etag" in resp.headers:
+            validators["If-None-Match"] = resp.headers["etag"]
+        if "last-modified" in resp.headers:
+            validators["If-Modified-Since"] = resp.headers["last-modified"]
+        if validators and resp.status_code == 200:
+            self._validated[url] = (validators, resp.content)
+            self._validated.move_to_end(url)
+            if len(self._validated) > VALIDATED_CACHE_SIZE:
+                self._validated.popitem(last=False)
         return resp.content
 
     def _decode_content(self, raw: bytes) -> str:
         """
         Decode page content.
-        If < is not present, it is likely base64-encoded HTML.
+        If < is not present near the start, it is likely base64-encoded HTML.
         """
         try:
-            if b"<" not in raw:
+            # HTML has a tag within the first few KB; no need to scan it all
+            if raw.find(b"<", 0, 4096) == -1:
                 decoded = base64.b64decode(raw).decode("utf-8", errors="ignore")
                 return decoded
             return raw.decode("utf-8", errors="ignore")
@@ -32,9 +93,15 @@ class WebScraper:
             return raw.decode("utf-8", errors="ignore")
 
     def _extract_visible_text(self, html: str) -> str:
-        """Extract clean visible text using BeautifulSoup."""
-        soup = BeautifulSoup(html, "html.parser")
-        return soup.get_text(separator=" ", strip=True)
+        """
+        Extract clean visible text with selectolax's C parser.
+        Falls back to BeautifulSoup if selectolax cannot handle the markup.
+        """
+        try:
+            return visible_text(HTMLParser(html), " ")
+        except Exception:
+            soup = BeautifulSoup(html, "lxml")
+            return soup.get_text(separator=" ", strip=True)
 
     def _extract_secret(self, text: str) -> str:
         """
@@ -43,28 +110,32 @@ class WebScraper:
         """
 
         # 1) Direct alphanumeric code
-        match = re.search(r"\b[A-Za-z0-9]{5,30}\b", text)
+        match = _RE_TOKEN.search(text)
         if match:
             return match.group(0)
 
         # 2) Patterns like "SECRET: s3crEt9"
-        match = re.search(
-            r"[Ss]ecret[^A-Za-z0-9]*([A-Za-z0-9]{4,30})",
-            text,
-        )
+        match = _RE_SECRET.search(text)
         if match:
             return match.group(1)
 
         # 3) Patterns like "The code is xyz123"
-        match = re.search(
-            r"[Cc]ode[^A-Za-z0-9]*([A-Za-z0-9]{4,30})",
-            text,
-        )
+        match = _RE_CODE.search(text)
         if match:
             return match.group(1)
 
         return "UNKNOWN"
 
+    def _fast_extract_secret(self, html: str) -> str:
+        """
+        Look for the secret without building a DOM: strip comments,
+        script/style blocks and tags with regex passes and unescape entities,
+        so the text matches the parsed-text path.
+        """
+        html = _RE_SCRIPT_STYLE.sub(" ", _RE_COMMENT.sub(" ", html))
+        text = html_lib.unescape(_RE_TAG.sub(" ", html))
+        return self._extract_secret(text)
+
     async def scrape_text(self, url: str) -> str:
         """
         High-level method:
@@ -75,7 +146,9 @@ class WebScraper:
         """
         raw = await self.fetch(url)
         html = self._decode_content(raw)
-        text = self._extract_visible_text(html)
 
-        secret = self._extract_secret(text)
+        secret = self._fast_extract_secret(html)
+        if secret == "UNKNOWN":
+            text = self._extract_visible_text(html)
+            secret = self._extract_secret(text)
         return secret